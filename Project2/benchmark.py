@@ -0,0 +1,151 @@
+# Dependencies
+import argparse
+import json
+import math
+import os
+import random
+import tempfile
+import time
+
+from main import solve
+
+BUNDLED_FILES = [
+    "test1.txt", "test2.txt", "test3.txt",
+    "gc_1378296846561000.txt", "gc_78317094521100.txt",
+    "gc_78317097930400.txt", "gc_78317097930401.txt",
+    "gc_78317100510400.txt", "gc_78317103208800.txt",
+]
+
+# Approximate average degree where random graphs stop being k-colorable
+PHASE_TRANSITION = {3: 4.69, 4: 8.90, 5: 13.69}
+
+# Average degree as a fraction of the phase transition value
+DENSITY_FACTORS = [0.8, 0.9, 1.0, 1.1, 1.2]
+
+
+# Random graph G(n, p): each pair is an edge with probability p
+def gnp_graph(n, p, rng):
+    edges = []
+    for u in range(n):
+        for v in range(u + 1, n):
+            if rng.random() < p:
+                edges.append((u, v))
+    return edges
+
+
+# Check if segments ab and cd cross (touching at an endpoint does not count)
+def segments_cross(a, b, c, d):
+    def orient(p, q, r):
+        return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+    return (orient(a, b, c) * orient(a, b, d) < 0 and
+            orient(c, d, a) * orient(c, d, b) < 0)
+
+
+# Planar-like graph: scatter points in the unit square, then add the shortest
+# non-crossing segments first until no more fit (a greedy triangulation).
+# Each segment is kept with probability keep to control the density.
+def planar_graph(n, keep, rng):
+    points = [(rng.random(), rng.random()) for _ in range(n)]
+    pairs = sorted(((u, v) for u in range(n) for v in range(u + 1, n)),
+                   key=lambda e: math.dist(points[e[0]], points[e[1]]))
+
+    segments = []
+    for u, v in pairs:
+        if any(segments_cross(points[u], points[v], points[a], points[b])
+               for a, b in segments
+               if len({u, v, a, b}) == 4):
+            continue
+        segments.append((u, v))
+    return [e for e in segments if rng.random() < keep]
+
+
+# Write a graph in the same format as the bundled files
+def write_graph(path, edges, k, title):
+    with open(path, "w") as f:
+        f.write(f"# {title}\n")
+        f.write("# Colors\n")
+        f.write(f"colors = {k}\n")
+        f.write("# Graph: \n")
+        for u, v in edges:
+            f.write(f"{u},{v}\n")
+
+
+# Random cases near the phase transition for every k
+def random_cases(n, seed):
+    rng = random.Random(seed)
+    cases = []
+    for k, degree in PHASE_TRANSITION.items():
+        for factor in DENSITY_FACTORS:
+            p = min(1.0, factor * degree / (n - 1))
+            cases.append({"name": f"gnp_n{n}_k{k}_x{factor}", "kind": "gnp",
+                          "n": n, "k": k, "p": p,
+                          "edges": gnp_graph(n, p, rng)})
+
+    # Planar graphs are always 4-colorable, so only k=3 is interesting
+    for factor in DENSITY_FACTORS:
+        keep = min(1.0, factor * PHASE_TRANSITION[3] / 6)
+        cases.append({"name": f"planar_n{n}_k3_x{factor}", "kind": "planar",
+                      "n": n, "k": 3, "keep": keep,
+                      "edges": planar_graph(n, keep, rng)})
+    return cases
+
+
+# Solve one file several times and keep the fastest run
+def run_file(path, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solution, stats = solve(path, with_stats=True)
+        total = time.perf_counter() - start
+        if best is None or total < best["total_time"]:
+            best = {"solved": solution is not None, "total_time": total,
+                    "stats": stats}
+    return best
+
+
+def run(n, seed, repeat, include_random=True):
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = []
+
+    for name in BUNDLED_FILES:
+        result = {"name": name, "kind": "bundled"}
+        result.update(run_file(os.path.join(here, name), repeat))
+        results.append(result)
+        print(f"{name}: {result['total_time']:.4f}s")
+
+    if include_random:
+        with tempfile.TemporaryDirectory() as tmp:
+            for case in random_cases(n, seed):
+                edges = case.pop("edges")
+                path = os.path.join(tmp, case["name"] + ".txt")
+                write_graph(path, edges, case["k"], case["name"])
+
+                # Isolated vertices are not written to the file, so record
+                # the number of vertices the solver actually sees
+                vertices = {v for e in edges for v in e}
+                result = dict(case, num_vertices=len(vertices),
+                              num_edges=len(edges))
+                result.update(run_file(path, repeat))
+                results.append(result)
+                print(f"{case['name']}: {result['total_time']:.4f}s")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the CSP solver")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--n", type=int, default=30,
+                        help="vertices in each random graph")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--bundled-only", action="store_true")
+    args = parser.parse_args()
+    if args.n < 2:
+        parser.error("--n must be at least 2")
+
+    results = run(args.n, args.seed, args.repeat,
+                  include_random=not args.bundled_only)
+    with open(args.output, "w") as f:
+        json.dump({"seed": args.seed, "n": args.n, "repeat": args.repeat,
+                   "results": results}, f, indent=2)
+    print(f"Results written to {args.output}")
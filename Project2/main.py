@@ -1,6 +1,6 @@
 # Dependencies
 from collections import defaultdict, deque
-import copy
+import time
 
 # Get vertices, edges, and number of colors from the input file
 def parse_file(path):
@@ -23,6 +23,18 @@ def parse_file(path):
     return list(vertices), list(edges), colors
 
 
+# Empty counters for solve(path, with_stats=True)
+def new_stats():
+    return {
+        "nodes": 0,
+        "backtracks": 0,
+        "revise_calls": 0,
+        "pruned": 0,
+        "queue_pushes": 0,
+        "time": {"parse": 0.0, "build": 0.0, "propagate": 0.0, "search": 0.0},
+    }
+
+
 # Build an adjacency list
 def build_graph(edges):
     g = defaultdict(set)
@@ -31,27 +43,65 @@ def build_graph(edges):
         g[v].add(u)
     return g
 
+# Count, for each vertex and color, how many neighbors still allow that color
+def build_support(domains, graph, k):
+    support = {v: [0] * k for v in domains}
+    for v in domains:
+        for n in graph[v]:
+            for c in domains[n]:
+                support[v][c] += 1
+    return support
+
+# Remove a value from a domain and update the support counts of its neighbors.
+# The removal is recorded on the trail so that undo() can put it back.
+def remove_value(domains, graph, var, value, support=None, trail=None):
+    domains[var].remove(value)
+    if support is not None:
+        for n in graph[var]:
+            support[n][value] -= 1
+    if trail is not None:
+        trail.append((var, value))
+
+# Put back every removal recorded on the trail after position mark
+def undo(domains, graph, trail, mark, support=None):
+    while len(trail) > mark:
+        var, value = trail.pop()
+        domains[var].append(value)
+        if support is not None:
+            for n in graph[var]:
+                support[n][value] += 1
+
 # Check if the value of xi is consistent with xj
-def revise(domains, xi, xj):
+def revise(domains, xi, xj, stats=None, graph=None, support=None, trail=None):
+    if support is not None and graph is None:
+        raise ValueError("graph is required when support is given")
+    if stats is not None:
+        stats["revise_calls"] += 1
     revised = False
     for x in set(domains[xi]):
         if all(x == y for y in domains[xj]):
-            domains[xi].remove(x)
+            remove_value(domains, graph, xi, x, support, trail)
             revised = True
+            if stats is not None:
+                stats["pruned"] += 1
     return revised
 
 # Arc Consistency Algorithm (AC-3)
-def ac3(domains, graph):
+def ac3(domains, graph, stats=None, support=None, trail=None):
     queue = deque([(x, y) for x in graph for y in graph[x]])
+    if stats is not None:
+        stats["queue_pushes"] += len(queue)
 
     while queue:
         xi, xj = queue.popleft()
-        if revise(domains, xi, xj):
+        if revise(domains, xi, xj, stats, graph, support, trail):
             if not domains[xi]:
                 return False
             for xk in graph[xi]:
                 if xk != xj:
                     queue.append((xk, xi))
+                    if stats is not None:
+                        stats["queue_pushes"] += 1
     return True
 
 # Minimum Remaining Values
@@ -60,40 +110,76 @@ def select_mrv(domains, assignment, graph):
     return min(unassigned, key=lambda v: (len(domains[v]), -len(graph[v])))
 
 # Least Constraining Value
-def order_lcv(var, domains, graph):
+# With support counts each value is scored in O(1) instead of scanning neighbors.
+def order_lcv(var, domains, graph, support=None):
+    if support is not None:
+        return sorted(domains[var], key=support[var].__getitem__)
+
     def conflicts(val):
         return sum(val in domains[n] for n in graph[var])
     return sorted(domains[var], key=conflicts)
 
 
-def backtrack(assignment, domains, graph):
+# Domains and support counts are changed in place and restored from the trail
+# when a value fails, so a failed search leaves them as they were.
+def backtrack(assignment, domains, graph, stats=None, support=None, trail=None):
+    if trail is None:
+        trail = []
+    if stats is not None:
+        stats["nodes"] += 1
     if len(assignment) == len(domains):
         return assignment
 
     var = select_mrv(domains, assignment, graph)
 
-    for value in order_lcv(var, domains, graph):
-        local_domains = copy.deepcopy(domains)
+    for value in order_lcv(var, domains, graph, support):
+        mark = len(trail)
         assignment[var] = value
-        local_domains[var] = [value]
+        for other in list(domains[var]):
+            if other != value:
+                remove_value(domains, graph, var, other, support, trail)
 
-        if ac3(local_domains, graph):
-            result = backtrack(assignment, local_domains, graph)
+        if ac3(domains, graph, stats, support, trail):
+            result = backtrack(assignment, domains, graph, stats, support,
+                               trail)
             if result:
                 return result
 
+        undo(domains, graph, trail, mark, support)
         assignment.pop(var)
+        if stats is not None:
+            stats["backtracks"] += 1
 
     return None
 
 # Main function to solve CSP
-def solve(path):
+# With with_stats=True it returns (solution, stats) instead of the solution.
+# "propagate" is the initial AC-3 pass; AC-3 run inside the search counts as "search".
+def solve(path, with_stats=False):
+    stats = new_stats() if with_stats else None
+    timings = stats["time"] if stats is not None else {}
+
+    start = time.perf_counter()
     vertices, edges, k = parse_file(path)
+    timings["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
     graph = build_graph(edges)
     domains = {v: list(range(k)) for v in vertices}
+    support = build_support(domains, graph, k)
+    timings["build"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ac3(domains, graph, stats, support)
+    timings["propagate"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solution = backtrack({}, domains, graph, stats, support)
+    timings["search"] = time.perf_counter() - start
 
-    ac3(domains, graph)
-    return backtrack({}, domains, graph)
+    if with_stats:
+        return solution, stats
+    return solution
 
 
 if __name__ == "__main__":
@@ -1,10 +1,15 @@
 import unittest
 import tempfile
 import os
+import random
 from collections import defaultdict
+from unittest.mock import patch
+import main
 from main import (parse_file, build_graph, 
                   revise, ac3, select_mrv, 
-                  order_lcv, solve)
+                  order_lcv, solve, new_stats,
+                  build_support, remove_value, undo, backtrack)
+from benchmark import segments_cross, planar_graph, gnp_graph
 
 class TestGraphColoringSolver(unittest.TestCase):
     
@@ -154,6 +159,105 @@ class TestGraphColoringSolver(unittest.TestCase):
         ordered = order_lcv(1, domains, graph)
         self.assertEqual(ordered, [0, 1])
     
+    def test_order_lcv_with_support(self):
+        domains = {1: [0, 1], 2: [0, 1], 3: [1]}
+        graph = {1: {2, 3}, 2: {1}, 3: {1}}
+        support = build_support(domains, graph, 2)
+
+        ordered = order_lcv(1, domains, graph, support)
+        self.assertEqual(ordered, order_lcv(1, domains, graph))
+
+    # Tests for support counts
+    def test_build_support(self):
+        domains = {1: [0, 1], 2: [0, 1], 3: [1]}
+        graph = {1: {2, 3}, 2: {1}, 3: {1}}
+        support = build_support(domains, graph, 2)
+
+        self.assertEqual(support, {1: [1, 2], 2: [1, 1], 3: [1, 1]})
+
+    def test_remove_value_updates_neighbors(self):
+        domains = {1: [0, 1], 2: [0, 1], 3: [0, 1]}
+        graph = {1: {2, 3}, 2: {1}, 3: {1}}
+        support = build_support(domains, graph, 2)
+        remove_value(domains, graph, 1, 0, support)
+
+        self.assertEqual(domains[1], [1])
+        self.assertEqual(support[2], [0, 1])
+        self.assertEqual(support[3], [0, 1])
+        self.assertEqual(support[1], [2, 2])
+
+    def test_undo_restores_domains_and_support(self):
+        domains = {1: [0, 1, 2], 2: [0, 1, 2], 3: [0, 1, 2]}
+        graph = {1: {2, 3}, 2: {1}, 3: {1}}
+        support = build_support(domains, graph, 3)
+        trail = []
+        remove_value(domains, graph, 1, 0, support, trail)
+        mark = len(trail)
+        remove_value(domains, graph, 1, 2, support, trail)
+        remove_value(domains, graph, 2, 1, support, trail)
+
+        undo(domains, graph, trail, mark, support)
+        self.assertEqual(trail, [(1, 0)])
+        self.assertEqual(sorted(domains[1]), [1, 2])
+        self.assertEqual(sorted(domains[2]), [0, 1, 2])
+        self.assertEqual(support, build_support(domains, graph, 3))
+
+    def test_revise_support_requires_graph(self):
+        domains = {1: [0, 1], 2: [0]}
+        support = build_support(domains, {1: {2}, 2: {1}}, 2)
+
+        with self.assertRaises(ValueError):
+            revise(domains, 1, 2, support=support)
+
+    # Support counts must match a fresh count at every search node,
+    # including after values are undone on backtrack
+    def test_backtrack_keeps_support_in_sync(self):
+        rng = random.Random(1)
+        k = 3
+        nodes = 0
+        backtracks = 0
+
+        for _ in range(30):
+            edges = [(u, v) for u in range(12) for v in range(u + 1, 12)
+                     if rng.random() < 0.4]
+            graph = build_graph(edges)
+            domains = {v: list(range(k)) for v in range(12)}
+            support = build_support(domains, graph, k)
+            stats = new_stats()
+
+            def checked(assignment, domains, graph, stats=None,
+                        support=None, trail=None):
+                self.assertEqual(support, build_support(domains, graph, k))
+                return backtrack(assignment, domains, graph, stats,
+                                 support, trail)
+
+            with patch.object(main, "backtrack", checked):
+                if ac3(domains, graph, stats, support):
+                    checked({}, domains, graph, stats, support)
+            nodes += stats["nodes"]
+            backtracks += stats["backtracks"]
+
+        self.assertGreater(backtracks, 0)
+        self.assertGreater(nodes, 30)
+
+    def test_failed_backtrack_restores_domains(self):
+        graph = build_graph([(1, 2), (2, 3), (3, 1)])
+        domains = {1: [0, 1], 2: [0, 1], 3: [0, 1]}
+        support = build_support(domains, graph, 2)
+
+        self.assertIsNone(backtrack({}, domains, graph, support=support))
+        self.assertEqual({v: sorted(d) for v, d in domains.items()},
+                         {1: [0, 1], 2: [0, 1], 3: [0, 1]})
+        self.assertEqual(support, build_support(domains, graph, 2))
+
+    def test_ac3_keeps_support_in_sync(self):
+        domains = {1: [0, 1, 2], 2: [0], 3: [1, 2], 4: [0, 1, 2]}
+        graph = {1: {2, 3}, 2: {1, 4}, 3: {1, 4}, 4: {2, 3}}
+        support = build_support(domains, graph, 3)
+
+        self.assertTrue(ac3(domains, graph, support=support))
+        self.assertEqual(support, build_support(domains, graph, 3))
+
     # Tests for solve function
     def test_solve_trivial(self):
         content = """colors=2\n1,2"""
@@ -220,5 +324,76 @@ class TestGraphColoringSolver(unittest.TestCase):
         for u, v in edges:
             self.assertNotEqual(solution[u], solution[v],
                                f"Vertices {u} and {v} have same color {solution[u]}")
+
+    # Tests for search statistics
+    def test_revise_counts_pruned_values(self):
+        domains = {1: [0, 1], 2: [0]}
+        stats = new_stats()
+        revise(domains, 1, 2, stats)
+
+        self.assertEqual(stats["revise_calls"], 1)
+        self.assertEqual(stats["pruned"], 1)
+
+    def test_ac3_counts_queue_pushes(self):
+        domains = {1: [0, 1], 2: [0, 1]}
+        graph = {1: {2}, 2: {1}}
+        stats = new_stats()
+        ac3(domains, graph, stats)
+
+        self.assertEqual(stats["queue_pushes"], 2)
+        self.assertEqual(stats["revise_calls"], 2)
+        self.assertEqual(stats["pruned"], 0)
+
+    def test_solve_with_stats(self):
+        content = """colors=3\n1,2\n2,3\n3,1\n3,4\n4,5\n5,3"""
+
+        path = self.create_test_file(content)
+        solution, stats = solve(path, with_stats=True)
+
+        self.assertEqual(solution, solve(path))
+        self.assertEqual(stats["nodes"], 6)
+        self.assertEqual(stats["backtracks"], 0)
+        self.assertGreater(stats["revise_calls"], 0)
+        self.assertEqual(set(stats["time"]),
+                         {"parse", "build", "propagate", "search"})
+
+    def test_solve_with_stats_unsolvable(self):
+        content = """colors=2\n1,2\n2,3\n3,1"""
+
+        path = self.create_test_file(content)
+        solution, stats = solve(path, with_stats=True)
+
+        self.assertIsNone(solution)
+        self.assertEqual(stats["nodes"], 1)
+        self.assertEqual(stats["backtracks"], 2)
+
+    # Tests for benchmark graph generators
+    def test_segments_cross(self):
+        self.assertTrue(segments_cross((0, 0), (1, 1), (0, 1), (1, 0)))
+        self.assertFalse(segments_cross((0, 0), (1, 1), (1, 1), (2, 0)))
+        self.assertFalse(segments_cross((0, 0), (1, 0), (0, 1), (1, 1)))
+
+    def test_planar_graph_reproducible_and_planar(self):
+        edges = planar_graph(25, 1.0, random.Random(7))
+        self.assertEqual(edges, planar_graph(25, 1.0, random.Random(7)))
+        self.assertGreater(len(edges), 0)
+
+        rng = random.Random(7)
+        points = [(rng.random(), rng.random()) for _ in range(25)]
+        for i, (a, b) in enumerate(edges):
+            for c, d in edges[i + 1:]:
+                if len({a, b, c, d}) == 4:
+                    self.assertFalse(segments_cross(points[a], points[b],
+                                                    points[c], points[d]))
+
+    def test_gnp_graph_reproducible(self):
+        edges = gnp_graph(20, 0.3, random.Random(3))
+        self.assertEqual(edges, gnp_graph(20, 0.3, random.Random(3)))
+        self.assertEqual(gnp_graph(20, 0.0, random.Random(3)), [])
+        self.assertEqual(len(gnp_graph(20, 1.0, random.Random(3))), 190)
+        for u, v in edges:
+            self.assertLess(u, v)
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()